@@ -2,87 +2,138 @@
 Tests for the Mergington High School API
 """
 
+from urllib.parse import quote
+
 import pytest
 from fastapi.testclient import TestClient
 from src.app import app, activities
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def client():
-    """Create a test client"""
-    return TestClient(app)
+    """Create a test client shared by the whole session"""
+    with TestClient(app) as c:
+        yield c
 
 
-@pytest.fixture(autouse=True)
-def reset_activities():
-    """Reset activities to initial state before each test"""
-    # Store original state
-    original_activities = {
-        "Soccer Team": {
-            "description": "Join the school soccer team and compete in local leagues",
-            "schedule": "Wednesdays and Fridays, 4:00 PM - 5:30 PM",
-            "max_participants": 22,
-            "participants": ["lucas@mergington.edu", "mia@mergington.edu"]
-        },
-        "Basketball Club": {
-            "description": "Practice basketball skills and play friendly matches",
-            "schedule": "Mondays and Thursdays, 3:30 PM - 5:00 PM",
-            "max_participants": 15,
-            "participants": ["liam@mergington.edu", "ava@mergington.edu"]
-        },
-        "Drama Club": {
-            "description": "Act, direct, and participate in school theater productions",
-            "schedule": "Tuesdays, 4:00 PM - 5:30 PM",
-            "max_participants": 18,
-            "participants": ["ella@mergington.edu", "noah@mergington.edu"]
-        },
-        "Art Workshop": {
-            "description": "Explore painting, drawing, and other visual arts",
-            "schedule": "Fridays, 3:30 PM - 5:00 PM",
-            "max_participants": 16,
-            "participants": ["grace@mergington.edu", "jack@mergington.edu"]
-        },
-        "Debate Team": {
-            "description": "Develop argumentation skills and compete in debates",
-            "schedule": "Wednesdays, 3:30 PM - 5:00 PM",
-            "max_participants": 10,
-            "participants": ["chloe@mergington.edu", "ethan@mergington.edu"]
-        },
-        "Math Club": {
-            "description": "Solve challenging math problems and prepare for competitions",
-            "schedule": "Mondays, 4:00 PM - 5:00 PM",
-            "max_participants": 14,
-            "participants": ["zoe@mergington.edu", "benjamin@mergington.edu"]
-        },
-        "Chess Club": {
-            "description": "Learn strategies and compete in chess tournaments",
-            "schedule": "Fridays, 3:30 PM - 5:00 PM",
-            "max_participants": 12,
-            "participants": ["michael@mergington.edu", "daniel@mergington.edu"]
-        },
-        "Programming Class": {
-            "description": "Learn programming fundamentals and build software projects",
-            "schedule": "Tuesdays and Thursdays, 3:30 PM - 4:30 PM",
-            "max_participants": 20,
-            "participants": ["emma@mergington.edu", "sophia@mergington.edu"]
-        },
-        "Gym Class": {
-            "description": "Physical education and sports activities",
-            "schedule": "Mondays, Wednesdays, Fridays, 2:00 PM - 3:00 PM",
-            "max_participants": 30,
-            "participants": ["john@mergington.edu", "olivia@mergington.edu"]
-        }
+@pytest.fixture(scope="session")
+def all_activities_json(client):
+    """Fetch GET /activities once for the read-only tests"""
+    response = client.get("/activities")
+    assert response.status_code == 200
+    return response.json()
+
+
+# Initial state of the activities, shared by every test. Never mutated
+# directly: the fixture below copies it into ``activities``.
+_TEMPLATE = {
+    "Soccer Team": {
+        "description": "Join the school soccer team and compete in local leagues",
+        "schedule": "Wednesdays and Fridays, 4:00 PM - 5:30 PM",
+        "max_participants": 22,
+        "participants": ["lucas@mergington.edu", "mia@mergington.edu"]
+    },
+    "Basketball Club": {
+        "description": "Practice basketball skills and play friendly matches",
+        "schedule": "Mondays and Thursdays, 3:30 PM - 5:00 PM",
+        "max_participants": 15,
+        "participants": ["liam@mergington.edu", "ava@mergington.edu"]
+    },
+    "Drama Club": {
+        "description": "Act, direct, and participate in school theater productions",
+        "schedule": "Tuesdays, 4:00 PM - 5:30 PM",
+        "max_participants": 18,
+        "participants": ["ella@mergington.edu", "noah@mergington.edu"]
+    },
+    "Art Workshop": {
+        "description": "Explore painting, drawing, and other visual arts",
+        "schedule": "Fridays, 3:30 PM - 5:00 PM",
+        "max_participants": 16,
+        "participants": ["grace@mergington.edu", "jack@mergington.edu"]
+    },
+    "Debate Team": {
+        "description": "Develop argumentation skills and compete in debates",
+        "schedule": "Wednesdays, 3:30 PM - 5:00 PM",
+        "max_participants": 10,
+        "participants": ["chloe@mergington.edu", "ethan@mergington.edu"]
+    },
+    "Math Club": {
+        "description": "Solve challenging math problems and prepare for competitions",
+        "schedule": "Mondays, 4:00 PM - 5:00 PM",
+        "max_participants": 14,
+        "participants": ["zoe@mergington.edu", "benjamin@mergington.edu"]
+    },
+    "Chess Club": {
+        "description": "Learn strategies and compete in chess tournaments",
+        "schedule": "Fridays, 3:30 PM - 5:00 PM",
+        "max_participants": 12,
+        "participants": ["michael@mergington.edu", "daniel@mergington.edu"]
+    },
+    "Programming Class": {
+        "description": "Learn programming fundamentals and build software projects",
+        "schedule": "Tuesdays and Thursdays, 3:30 PM - 4:30 PM",
+        "max_participants": 20,
+        "participants": ["emma@mergington.edu", "sophia@mergington.edu"]
+    },
+    "Gym Class": {
+        "description": "Physical education and sports activities",
+        "schedule": "Mondays, Wednesdays, Fridays, 2:00 PM - 3:00 PM",
+        "max_participants": 30,
+        "participants": ["john@mergington.edu", "olivia@mergington.edu"]
     }
-    
-    # Reset activities before test
+}
+
+# Quoted endpoint paths for each activity, built once at import
+_SIGNUP_URL = {name: f"/activities/{quote(name)}/signup" for name in _TEMPLATE}
+_PARTICIPANTS_URL = {
+    name: f"/activities/{quote(name)}/participants" for name in _TEMPLATE
+}
+
+
+# Only the participant lists are mutated by the API, so they are all a
+# reset needs to restore
+_PARTICIPANTS = {
+    name: tuple(activity["participants"]) for name, activity in _TEMPLATE.items()
+}
+
+
+def _restore_activities():
+    """Replace the contents of ``activities`` with a fresh copy of the template"""
     activities.clear()
-    activities.update(original_activities)
-    
+    activities.update({
+        name: {**activity, "participants": list(activity["participants"])}
+        for name, activity in _TEMPLATE.items()
+    })
+
+
+def _restore_participants():
+    """Reset each activity's participants list in place to the template"""
+    # The endpoints only append to or remove from existing lists, so the
+    # activity dicts themselves can be kept and no new objects allocated.
+    # If activities were added or removed, rebuild everything instead.
+    if activities.keys() != _PARTICIPANTS.keys():
+        _restore_activities()
+        return
+    for name, participants in _PARTICIPANTS.items():
+        activities[name]["participants"][:] = participants
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _seed_activities():
+    """Seed activities with the initial state once per session
+
+    Under pytest-xdist (``pytest -n auto``) every worker is its own process
+    with its own ``activities`` dict and session, so each worker seeds its
+    own copy. Seeding rebuilds from the template and is safe to repeat.
+    """
+    _restore_activities()
+
+
+@pytest.fixture
+def reset_activities():
+    """Restore activities to initial state after a test that may change them"""
     yield
-    
-    # Reset activities after test
-    activities.clear()
-    activities.update(original_activities)
+    _restore_participants()
 
 
 class TestRootEndpoint:
@@ -98,73 +149,45 @@ class TestRootEndpoint:
 class TestGetActivities:
     """Tests for GET /activities endpoint"""
     
-    def test_get_activities_returns_all_activities(self, client):
-        """Test that GET /activities returns all activities"""
-        response = client.get("/activities")
-        assert response.status_code == 200
-        data = response.json()
-        assert len(data) == 9
-        assert "Soccer Team" in data
-        assert "Basketball Club" in data
-        assert "Programming Class" in data
-    
-    def test_get_activities_structure(self, client):
-        """Test that activities have correct structure"""
-        response = client.get("/activities")
-        data = response.json()
-        
-        soccer = data["Soccer Team"]
-        assert "description" in soccer
-        assert "schedule" in soccer
-        assert "max_participants" in soccer
-        assert "participants" in soccer
-        assert isinstance(soccer["participants"], list)
-        assert soccer["max_participants"] == 22
-        assert len(soccer["participants"]) == 2
+    def test_get_activities_returns_all_activities(self, all_activities_json):
+        """Test that GET /activities returns every activity with its details"""
+        assert all_activities_json == _TEMPLATE
 
 
 class TestSignupForActivity:
     """Tests for POST /activities/{activity_name}/signup endpoint"""
     
+    @pytest.mark.usefixtures("reset_activities")
     def test_signup_success(self, client):
         """Test successful signup for an activity"""
         response = client.post(
-            "/activities/Soccer%20Team/signup?email=test@mergington.edu"
+            _SIGNUP_URL["Soccer Team"] + "?email=test@mergington.edu"
         )
         assert response.status_code == 200
         data = response.json()
         assert data["message"] == "Signed up test@mergington.edu for Soccer Team"
         
         # Verify participant was added
-        activities_response = client.get("/activities")
-        activities_data = activities_response.json()
-        assert "test@mergington.edu" in activities_data["Soccer Team"]["participants"]
+        assert "test@mergington.edu" in activities["Soccer Team"]["participants"]
     
+    @pytest.mark.usefixtures("reset_activities")
     def test_signup_duplicate_participant(self, client):
         """Test that signing up twice returns an error"""
         email = "lucas@mergington.edu"
         response = client.post(
-            f"/activities/Soccer%20Team/signup?email={email}"
+            _SIGNUP_URL["Soccer Team"] + f"?email={email}"
         )
         assert response.status_code == 400
         data = response.json()
         assert "already signed up" in data["detail"].lower()
     
-    def test_signup_nonexistent_activity(self, client):
-        """Test signup for non-existent activity"""
-        response = client.post(
-            "/activities/Fake%20Activity/signup?email=test@mergington.edu"
-        )
-        assert response.status_code == 404
-        data = response.json()
-        assert "not found" in data["detail"].lower()
-    
+    @pytest.mark.usefixtures("reset_activities")
     def test_signup_updates_participant_list(self, client):
         """Test that signup correctly updates the participants list"""
         initial_response = client.get("/activities")
         initial_count = len(initial_response.json()["Math Club"]["participants"])
         
-        client.post("/activities/Math%20Club/signup?email=newstudent@mergington.edu")
+        client.post(_SIGNUP_URL["Math Club"] + "?email=newstudent@mergington.edu")
         
         updated_response = client.get("/activities")
         updated_count = len(updated_response.json()["Math Club"]["participants"])
@@ -175,56 +198,58 @@ class TestSignupForActivity:
 class TestUnregisterParticipant:
     """Tests for DELETE /activities/{activity_name}/participants/{email} endpoint"""
     
+    @pytest.mark.usefixtures("reset_activities")
     def test_unregister_success(self, client):
         """Test successful unregistration of a participant"""
         response = client.delete(
-            "/activities/Soccer%20Team/participants/lucas@mergington.edu"
+            _PARTICIPANTS_URL["Soccer Team"] + "/lucas@mergington.edu"
         )
         assert response.status_code == 200
         data = response.json()
         assert data["message"] == "Unregistered lucas@mergington.edu from Soccer Team"
         
         # Verify participant was removed
-        activities_response = client.get("/activities")
-        activities_data = activities_response.json()
-        assert "lucas@mergington.edu" not in activities_data["Soccer Team"]["participants"]
-    
-    def test_unregister_nonexistent_participant(self, client):
-        """Test unregistering a participant who isn't signed up"""
-        response = client.delete(
-            "/activities/Soccer%20Team/participants/notregistered@mergington.edu"
-        )
-        assert response.status_code == 404
-        data = response.json()
-        assert "not found" in data["detail"].lower()
-    
-    def test_unregister_nonexistent_activity(self, client):
-        """Test unregistering from a non-existent activity"""
-        response = client.delete(
-            "/activities/Fake%20Activity/participants/test@mergington.edu"
-        )
-        assert response.status_code == 404
-        data = response.json()
-        assert "not found" in data["detail"].lower()
+        assert "lucas@mergington.edu" not in activities["Soccer Team"]["participants"]
     
+    @pytest.mark.usefixtures("reset_activities")
     def test_unregister_updates_participant_list(self, client):
         """Test that unregistration correctly updates the participants list"""
         initial_response = client.get("/activities")
         initial_count = len(initial_response.json()["Drama Club"]["participants"])
         
-        client.delete("/activities/Drama%20Club/participants/ella@mergington.edu")
+        client.delete(_PARTICIPANTS_URL["Drama Club"] + "/ella@mergington.edu")
         
         updated_response = client.get("/activities")
-        updated_count = len(updated_response.json()["Drama Club"]["participants"])
         updated_participants = updated_response.json()["Drama Club"]["participants"]
+        updated_count = len(updated_participants)
         
         assert updated_count == initial_count - 1
         assert "ella@mergington.edu" not in updated_participants
 
 
+class TestNotFound:
+    """Tests for requests naming an unknown activity or participant"""
+    
+    @pytest.mark.parametrize("method,url", [
+        ("POST", "/activities/Fake%20Activity/signup?email=test@mergington.edu"),
+        ("DELETE", "/activities/Fake%20Activity/participants/test@mergington.edu"),
+        ("DELETE",
+         _PARTICIPANTS_URL["Soccer Team"] + "/notregistered@mergington.edu"),
+    ], ids=["signup_nonexistent_activity", "unregister_nonexistent_activity",
+            "unregister_nonexistent_participant"])
+    @pytest.mark.usefixtures("reset_activities")
+    def test_returns_404(self, client, method, url):
+        """Test that unknown activities and participants return 404"""
+        response = client.request(method, url)
+        assert response.status_code == 404
+        data = response.json()
+        assert "not found" in data["detail"].lower()
+
+
 class TestEndToEndWorkflow:
     """End-to-end workflow tests"""
     
+    @pytest.mark.usefixtures("reset_activities")
     def test_signup_and_unregister_workflow(self, client):
         """Test complete workflow of signing up and then unregistering"""
         email = "workflow@mergington.edu"
@@ -237,18 +262,16 @@ class TestEndToEndWorkflow:
         
         # Sign up
         signup_response = client.post(
-            f"/activities/{activity.replace(' ', '%20')}/signup?email={email}"
+            _SIGNUP_URL[activity] + f"?email={email}"
         )
         assert signup_response.status_code == 200
         
         # Verify signup
-        after_signup_response = client.get("/activities")
-        after_signup_participants = after_signup_response.json()[activity]["participants"]
-        assert email in after_signup_participants
+        assert email in activities[activity]["participants"]
         
         # Unregister
         unregister_response = client.delete(
-            f"/activities/{activity.replace(' ', '%20')}/participants/{email}"
+            _PARTICIPANTS_URL[activity] + f"/{email}"
         )
         assert unregister_response.status_code == 200
         